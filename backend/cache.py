@@ -0,0 +1,123 @@
+"""
+Response caching utilities for the Todo App backend API
+"""
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Optional
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Cached task lists expire after this many seconds even without a write
+TASK_LIST_TTL = 300
+
+# Seconds to wait on Redis before giving up and using the database, so a hung
+# or unreachable cache can't stall requests or hold back a committed write
+REDIS_TIMEOUT = 0.2
+
+# Errors that mean the cache is unavailable; any of them falls back to the database
+_CACHE_ERRORS = (RedisError, asyncio.TimeoutError)
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> Optional[aioredis.Redis]:
+    """
+    Create the Redis client on first use, or return None when caching is not configured
+    """
+    if not settings.REDIS_URL:
+        return None
+    return aioredis.from_url(
+        settings.REDIS_URL,
+        socket_connect_timeout=REDIS_TIMEOUT,
+        socket_timeout=REDIS_TIMEOUT,
+    )
+
+
+async def close_redis():
+    """
+    Close the Redis connection pool if one was opened
+    """
+    redis = get_redis()
+    if redis is not None:
+        await redis.aclose()
+
+
+def _task_list_generation_key(user_id: int) -> str:
+    """
+    Key of the counter bumped on every write to a user's tasks
+    """
+    return f"tasks:gen:{user_id}"
+
+
+def _task_list_key(user_id: int, generation: int) -> str:
+    """
+    Cache key for a user's task list; always scoped to the user ID and the
+    generation it was built from
+    """
+    return f"tasks:{user_id}:{generation}"
+
+
+async def get_task_list_generation(user_id: int) -> Optional[int]:
+    """
+    Get the current generation of a user's task list, or None when the cache
+    is unavailable. Read it before querying the database: a body built from a
+    query that raced with a write is then stored under the old generation,
+    which readers no longer use
+    """
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        generation = await redis.get(_task_list_generation_key(user_id))
+    except _CACHE_ERRORS:
+        # Fall back to the database rather than failing the request
+        logger.warning("Could not read task list generation for user %s", user_id, exc_info=True)
+        return None
+    return int(generation) if generation is not None else 0
+
+
+async def get_cached_task_list(user_id: int, generation: int) -> Optional[bytes]:
+    """
+    Get the cached JSON body of a user's task list for a generation, if any
+    """
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        return await redis.get(_task_list_key(user_id, generation))
+    except _CACHE_ERRORS:
+        # Fall back to the database rather than failing the request
+        logger.warning("Could not read task list cache for user %s", user_id, exc_info=True)
+        return None
+
+
+async def set_cached_task_list(user_id: int, generation: int, body: bytes):
+    """
+    Cache the JSON body of a user's task list under the generation it was built from
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(_task_list_key(user_id, generation), body, ex=TASK_LIST_TTL)
+    except _CACHE_ERRORS:
+        logger.warning("Could not write task list cache for user %s", user_id, exc_info=True)
+
+
+async def invalidate_task_list(user_id: int):
+    """
+    Retire a user's cached task list after one of their tasks changes by
+    bumping the generation; entries for older generations expire on their own
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.incr(_task_list_generation_key(user_id))
+    except _CACHE_ERRORS:
+        logger.warning("Could not invalidate task list cache for user %s", user_id, exc_info=True)
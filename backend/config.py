@@ -3,26 +3,57 @@ Configuration settings for the Todo App backend API
 """
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file in the backend directory
+# .env file lives in the backend directory
 backend_dir = Path(__file__).parent
-load_dotenv(backend_dir / ".env")
 
+# Set once the .env file has been parsed so it is never read twice
+_LOADED = False
+
+
+def _load_env() -> None:
+    """
+    Load environment variables from the backend .env file exactly once
+    """
+    global _LOADED
+    if not _LOADED:
+        load_dotenv(backend_dir / ".env")
+        _LOADED = True
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Application settings loaded from environment variables"""
 
     # Database settings
-    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./todo_app.db")
+    DATABASE_URL: str
+    DB_POOL_SIZE: int
+    DB_MAX_OVERFLOW: int
 
     # JWT settings
-    SECRET_KEY: str = os.getenv("SECRET_KEY", os.getenv("AUTH_SECRET", "KPUqFcCE/cmK7jg73LieWXczeHwnHlb4Hde1EcVrbCo="))
-    ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+    SECRET_KEY: str
+    ALGORITHM: str
+    ACCESS_TOKEN_EXPIRE_MINUTES: int
+
+    # Password hashing work factor (PBKDF2-SHA256 iterations)
+    PASSWORD_HASH_ROUNDS: int
+
+    # Origins allowed to call the API from a browser
+    CORS_ORIGINS: tuple[str, ...]
+
+    # Optional Redis used to cache task lists; caching is off when unset
+    REDIS_URL: Optional[str]
+
+    # Run create_all on startup for non-SQLite databases too; SQLite always does
+    AUTO_CREATE_TABLES: bool = False
 
     # App settings
+    DEBUG: bool = False
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Todo App Backend API"
 
@@ -30,4 +61,26 @@ class Settings:
     MOCK_USER_ID: int = 1  # Default mock user ID
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Build the application settings once and return the cached instance
+    """
+    _load_env()
+    return Settings(
+        DATABASE_URL=os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./todo_app.db"),
+        DB_POOL_SIZE=int(os.getenv("DB_POOL_SIZE", "5")),
+        DB_MAX_OVERFLOW=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        SECRET_KEY=os.getenv("SECRET_KEY", os.getenv("AUTH_SECRET", "KPUqFcCE/cmK7jg73LieWXczeHwnHlb4Hde1EcVrbCo=")),
+        ALGORITHM=os.getenv("ALGORITHM", "HS256"),
+        ACCESS_TOKEN_EXPIRE_MINUTES=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")),
+        PASSWORD_HASH_ROUNDS=int(os.getenv("PASSWORD_HASH_ROUNDS", "29000")),
+        CORS_ORIGINS=tuple(
+            origin.strip()
+            for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+            if origin.strip()
+        ),
+        REDIS_URL=os.getenv("REDIS_URL") or None,
+        AUTO_CREATE_TABLES=os.getenv("AUTO_CREATE_TABLES", "false").lower() in ("1", "true", "yes"),
+        DEBUG=os.getenv("DEBUG", "false").lower() in ("1", "true", "yes"),
+    )
@@ -1,37 +1,50 @@
 """
 Database utilities for the Todo App backend API
 """
-from typing import AsyncGenerator
+import asyncio
+import logging
+from functools import lru_cache
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.pool import StaticPool
-from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from sqlalchemy import event, text
 from sqlalchemy.engine import Engine
 
-try:
-    from config import settings
-except ImportError:
-    from backend.config import settings
+from config import get_settings
+from models.user import User  # Import to register the model
+from models.task import Task  # Import to register the model
 
-# Create async engine for the database
-# For SQLite, use StaticPool and disable some pooling features
-if settings.DATABASE_URL.startswith("sqlite"):
-    async_engine = create_async_engine(
-        settings.DATABASE_URL,
-        poolclass=StaticPool,
-        echo=True,  # Enable for debugging
-        connect_args={"check_same_thread": False}
-    )
-else:
-    from sqlalchemy.pool import NullPool
-    # Use NullPool for Neon PostgreSQL to avoid prepared statement cache issues
-    # with pgbouncer connection pooling
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """
+    Create the async engine on first use and return the shared instance
+    """
+    # For SQLite, use StaticPool and disable some pooling features
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return create_async_engine(
+            settings.DATABASE_URL,
+            poolclass=StaticPool,
+            echo=settings.DEBUG,  # Log every statement only when debugging
+            connect_args={"check_same_thread": False}
+        )
+
+    # Keep a real connection pool for Neon PostgreSQL so requests reuse open
+    # connections instead of paying a TCP+TLS handshake each time. Size it to
+    # the worker's expected concurrency with DB_POOL_SIZE / DB_MAX_OVERFLOW
     # Disable prepared statement cache to work with Neon's connection pooler
-    async_engine = create_async_engine(
+    return create_async_engine(
         settings.DATABASE_URL,
-        poolclass=NullPool,
-        echo=False,
+        echo=settings.DEBUG,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=1800,
         connect_args={
             "prepared_statement_cache_size": 0,
             "statement_cache_size": 0,
@@ -39,31 +52,60 @@ else:
     )
 
 
+@lru_cache(maxsize=1)
+def get_session_maker() -> async_sessionmaker:
+    """
+    Get the shared session factory bound to the lazily created engine.
+    Objects stay loaded after commit so handlers can return them without another SELECT
+    """
+    return async_sessionmaker(
+        get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+
+async def warm_up_pool():
+    """
+    Open pooled connections ahead of the first requests
+    """
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return
+
+    engine = get_engine()
+
+    async def _ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Run concurrently so each ping checks out its own connection. Failures are
+    # collected rather than raised: warming is only an optimisation, and a
+    # sleeping or unreachable database must not stop the app from starting
+    results = await asyncio.gather(
+        *(_ping() for _ in range(engine.pool.size())), return_exceptions=True
+    )
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        logger.warning(
+            "Could not warm up %d of %d pooled connections: %s",
+            len(errors), len(results), errors[0],
+        )
+
+
 async def create_db_and_tables():
     """
     Create database tables
-    This is primarily for testing purposes in Phase 2
+    Always run for local SQLite; other databases only when AUTO_CREATE_TABLES
+    is set, e.g. for the first deploy against an empty database
     """
     try:
-        try:
-            from models.user import User  # Import to register the model
-            from models.task import Task  # Import to register the model
-        except ImportError:
-            from backend.models.user import User
-            from backend.models.task import Task
-
-        async with async_engine.begin() as conn:
+        async with get_engine().begin() as conn:
             await conn.run_sync(SQLModel.metadata.create_all)
     except Exception as e:
         # In production or shared databases, we might not have permission to create tables
         # Log the error but don't crash the application
-        print(f"Warning: Could not create database tables: {str(e)}")
-        print("This is expected in production environments where tables are pre-created")
-
-
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    """
-    Get async database session
-    """
-    async with AsyncSession(async_engine) as session:
-        yield session
\ No newline at end of file
+        logger.warning(
+            "Could not create database tables: %s. This is expected in production "
+            "environments where tables are pre-created",
+            e,
+        )
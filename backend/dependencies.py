@@ -1,37 +1,50 @@
 """
 Dependency injection functions for the Todo App backend API
 """
+import asyncio
 from typing import AsyncGenerator
-from fastapi import Depends, HTTPException, status
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
 
-try:
-    from database import async_engine
-    from models.user import User
-    from utils import verify_token
-except ImportError:
-    from backend.database import async_engine
-    from backend.models.user import User
-    from backend.utils import verify_token
+from config import get_settings
+from models.user import User, UserRead
+from utils import verify_token
 
+settings = get_settings()
 
-# OAuth2 scheme for JWT token
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/login")
 
+# OAuth2 scheme for JWT token, shared by every route that needs a bearer token
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+# Short-lived cache of authenticated users keyed by user ID, so repeated
+# requests with the same token skip the user lookup
+_user_cache = TTLCache(maxsize=10_000, ttl=15)
+_user_cache_lock = asyncio.Lock()
+
+
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
-    Get database session dependency
+    Get database session dependency from the session factory attached at startup
     """
-    async with AsyncSession(async_engine) as session:
+    async with request.app.state.session_maker() as session:
         yield session
 
 
-def get_user_id_from_token(token: str = Depends(oauth2_scheme)) -> int:
+def invalidate_user(user_id: int) -> None:
     """
-    Extract and validate user ID from JWT token
+    Drop a cached user so the next request reloads it from the database
+    """
+    _user_cache.pop(user_id, None)
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db_session: AsyncSession = Depends(get_db_session)
+) -> UserRead:
+    """
+    Get current authenticated user from JWT token using the shared session
     """
     user_id = verify_token(token)
     if user_id is None:
@@ -40,33 +53,42 @@ def get_user_id_from_token(token: str = Depends(oauth2_scheme)) -> int:
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user_id
 
+    async with _user_cache_lock:
+        cached_user = _user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
 
-async def get_current_user(
-    user_id: int = Depends(get_user_id_from_token),
-    db_session: AsyncSession = Depends(get_db_session)
-) -> User:
-    """
-    Get current authenticated user from JWT token using the shared session
-    """
-    result = await db_session.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db_session.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return user
+
+    # Cache only the public fields, never the password hash
+    user_read = UserRead.model_validate(user)
+    async with _user_cache_lock:
+        _user_cache[user_id] = user_read
+    return user_read
 
 
-def validate_user_id_match(user_id: int, token_user_id: int = Depends(get_user_id_from_token)):
+async def validate_user_id_match(user_id: int, token: str = Depends(oauth2_scheme)) -> int:
     """
-    Validate that the user_id in the path matches the authenticated user
+    Validate the JWT token and check that the user_id in the path matches the
+    authenticated user, in a single dependency so each request resolves one frame.
+    Declared async so FastAPI runs it inline instead of in the threadpool
     """
+    token_user_id = verify_token(token)
+    if token_user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     if user_id != token_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User ID does not match authenticated user"
         )
-    return user_id
\ No newline at end of file
+    return user_id
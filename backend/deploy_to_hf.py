@@ -14,6 +14,7 @@ FILES_TO_UPLOAD = [
     "README.md",
     "requirements.txt",
     "main.py",
+    "cache.py",
     "config.py",
     "database.py",
     "dependencies.py",
@@ -3,26 +3,70 @@ Main FastAPI application for the Todo App backend API
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
-# Add the current directory to the path for both local and HF deployment
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-# Also add parent directory for local development with `backend.` imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-try:
-    # Try relative imports first (for HF deployment)
-    from config import settings
-    from database import create_db_and_tables
-    from routes import tasks
-    from routes import auth
-except ImportError:
-    # Fall back to absolute imports (for local development)
-    from backend.config import settings
-    from backend.database import create_db_and_tables
-    from backend.routes import tasks
-    from backend.routes import auth
+# Put the backend directory on the path exactly once so the flat imports below
+# resolve the same way locally and on HF, where it is the deployment root
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from cache import close_redis
+from config import get_settings
+from database import create_db_and_tables, get_session_maker, warm_up_pool
+from routes import tasks
+from routes import auth
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Route application log records through a queue so the blocking stream write
+# happens on the listener thread instead of the event loop
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, logging.StreamHandler())
+logging.getLogger().addHandler(QueueHandler(log_queue))
+
+
+class UnhandledErrorMiddleware:
+    """
+    Log any error a route didn't handle and return a generic 500 response,
+    so endpoints don't each need their own catch-all. Added before
+    CORSMiddleware so it runs inside it and the 500 keeps the CORS headers
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            logger.exception("Unhandled error on %s %s", scope["method"], scope["path"])
+            # Too late to replace a response that is already being sent
+            if response_started:
+                raise
+            response = ORJSONResponse(
+                status_code=500,
+                content={"detail": "An unexpected error occurred"}
+            )
+            await response(scope, receive, send)
 
 
 # Create FastAPI application instance
@@ -32,15 +76,19 @@ app = FastAPI(
     description="Todo App Backend API - Phase 3 Implementation with Authentication",
     openapi_url="/api/v1/openapi.json",
     docs_url="/api/v1/docs",
-    redoc_url="/api/v1/redoc"
+    redoc_url="/api/v1/redoc",
+    default_response_class=ORJSONResponse
 )
 
+# Catch unhandled errors inside the CORS layer added below
+app.add_middleware(UnhandledErrorMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=list(settings.CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
 
@@ -48,9 +96,31 @@ app.add_middleware(
 @app.on_event("startup")
 async def on_startup():
     """
-    Initialize database tables on startup
+    Attach the shared session factory, create tables (always for SQLite,
+    otherwise when AUTO_CREATE_TABLES is set) and warm the connection pool on startup
+    """
+    log_listener.start()
+    # A deployed frontend is rejected by the localhost-only default origin list
+    if "CORS_ORIGINS" not in os.environ and not settings.DATABASE_URL.startswith("sqlite"):
+        logger.warning(
+            "CORS_ORIGINS is not set; only %s may call the API from a browser. "
+            "Set CORS_ORIGINS to the deployed frontend's origin",
+            ", ".join(settings.CORS_ORIGINS),
+        )
+    app.state.session_maker = get_session_maker()
+    # Shared databases only get DDL when asked for; skip the round trips otherwise
+    if settings.DATABASE_URL.startswith("sqlite") or settings.AUTO_CREATE_TABLES:
+        await create_db_and_tables()
+    await warm_up_pool()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """
+    Close the cache connection and flush queued log records on shutdown
     """
-    await create_db_and_tables()
+    await close_redis()
+    log_listener.stop()
 
 
 # Include the auth and tasks routers
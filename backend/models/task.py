@@ -3,6 +3,7 @@ Task model for the Todo App backend API
 """
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Column, DateTime, func
 from sqlmodel import Field, SQLModel
 
 
@@ -21,8 +22,21 @@ class Task(TaskBase, table=True):
     Task model representing a user's todo item
     """
     id: Optional[int] = Field(default=None, primary_key=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    # Timestamps are set by the database clock: now() is rendered into each
+    # INSERT/UPDATE, so existing tables without a column default still work
+    created_at: datetime = Field(
+        sa_column=Column(DateTime, nullable=False, default=func.now(), server_default=func.now(), index=True)
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(
+            DateTime,
+            nullable=False,
+            default=func.now(),
+            server_default=func.now(),
+            onupdate=func.now(),
+            index=True,
+        )
+    )
     # Note: completed is inherited from TaskBase
 
 
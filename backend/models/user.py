@@ -3,6 +3,7 @@ User model for the Todo App backend API with authentication
 """
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Column, DateTime, func
 from sqlmodel import Field, SQLModel
 
 
@@ -18,7 +19,9 @@ class User(UserBase, table=True):
     User model with authentication support
     """
     id: Optional[int] = Field(default=None, primary_key=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime, nullable=False, default=func.now(), server_default=func.now())
+    )
     hashed_password: str = Field(nullable=False)
     is_active: bool = Field(default=True)
 
@@ -1,26 +1,47 @@
 """
 Authentication routes for the Todo App backend API
 """
+import asyncio
+import os
+import anyio
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import bindparam, exists
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 
-try:
-    from dependencies import get_db_session
-    from models.user import User, UserCreate, UserLogin, Token, UserRead
-    from utils import verify_password, get_password_hash, create_access_token
-    from config import settings
-except ImportError:
-    from backend.dependencies import get_db_session
-    from backend.models.user import User, UserCreate, UserLogin, Token, UserRead
-    from backend.utils import verify_password, get_password_hash, create_access_token
-    from backend.config import settings
+from dependencies import get_db_session, get_current_user
+from models.user import User, UserCreate, UserLogin, Token, UserRead
+from utils import MAX_PASSWORD_BYTES, verify_password, get_password_hash, create_access_token
 
 
 # Create API router for auth endpoints
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+# Email lookup built once at import; only the bound email changes per request
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_EMAIL_EXISTS = select(exists().where(User.email == bindparam("email")))
+
+# Caps concurrent password hashing threads at the CPU count so a login burst
+# can't tie up the whole worker thread pool
+_kdf_semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
+# SQLSTATE Postgres reports for a unique constraint violation
+_UNIQUE_VIOLATION = "23505"
+
+
+def _is_duplicate_email(error: IntegrityError) -> bool:
+    """
+    Check whether an IntegrityError came from the unique constraint on user.email
+    """
+    # asyncpg's own exception, carrying the SQLSTATE and constraint name, is
+    # chained behind SQLAlchemy's driver-level error
+    driver_error = error.orig.__cause__ or error.orig
+    if getattr(driver_error, "sqlstate", None) == _UNIQUE_VIOLATION:
+        return "email" in (getattr(driver_error, "constraint_name", None) or "")
+    # SQLite only names the column in the message
+    return "UNIQUE constraint failed: user.email" in str(error.orig)
 
 
 @router.post("/register", response_model=UserRead)
@@ -41,62 +62,54 @@ async def register_user(
     Raises:
         HTTPException: If email already exists or registration fails
     """
-    try:
-        # Check if user with email already exists
-        existing_user_result = await db_session.execute(
-            select(User).where(User.email == user_create.email)
+    # Check if user with email already exists
+    email_taken = await db_session.scalar(
+        _EMAIL_EXISTS, {"email": user_create.email}
+    )
+    if email_taken:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists"
         )
-        existing_user = existing_user_result.scalar_one_or_none()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="User with this email already exists"
-            )
-
-        # Hash the password, handling potential bcrypt issues
-        try:
-            hashed_password = get_password_hash(user_create.password)
-        except Exception as e:
-            print(f"Password hashing error: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid password format"
-            )
 
-        # Create new user
-        db_user = User(
-            email=user_create.email,
-            hashed_password=hashed_password
+    # Reject passwords the hasher would refuse before doing any work
+    if len(user_create.password.encode()) > MAX_PASSWORD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Password too long"
         )
 
-        # Add user to database
-        db_session.add(db_user)
-        await db_session.commit()
-        await db_session.refresh(db_user)
-
-        # Return user data (excluding password)
-        return UserRead(
-            id=db_user.id,
-            email=db_user.email,
-            created_at=db_user.created_at,
-            is_active=db_user.is_active
+    # Run the KDF in a worker thread so it doesn't block the event loop
+    async with _kdf_semaphore:
+        hashed_password = await anyio.to_thread.run_sync(
+            get_password_hash, user_create.password
         )
 
-    except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
-        raise
-    except Exception as e:
-        # Log the error (in a real application, use proper logging)
-        print(f"Unexpected error during user registration: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    # Create new user
+    db_user = User(
+        email=user_create.email,
+        hashed_password=hashed_password
+    )
 
-        # Raise HTTP exception with structured response
+    # Add user to database
+    db_session.add(db_user)
+    try:
+        await db_session.commit()
+    except IntegrityError as e:
+        await db_session.rollback()
+        # Any other constraint failure is a bug, not a duplicate; let it reach
+        # the app-wide handler so it is logged as a 500
+        if not _is_duplicate_email(e):
+            raise
+        # Another request registered the same email after the check above
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred during registration"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists"
         )
 
+    # response_model=UserRead projects the row and drops the password hash
+    return db_user
+
 
 @router.post("/login", response_model=Token)
 async def login_user(
@@ -116,78 +129,59 @@ async def login_user(
     Raises:
         HTTPException: If credentials are invalid
     """
-    try:
-        # Find user by email
-        result = await db_session.execute(
-            select(User).where(User.email == form_data.username)
+    # Find user by email
+    result = await db_session.execute(
+        _USER_BY_EMAIL, {"email": form_data.username}
+    )
+    user = result.scalar_one_or_none()
+
+    # Check if user exists first
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-        user = result.scalar_one_or_none()
-
-        # Check if user exists first
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        # Verify password, handling potential bcrypt issues
-        try:
-            password_valid = verify_password(form_data.password, user.hashed_password)
-        except Exception as e:
-            print(f"Password verification error: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication error",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
 
-        if not password_valid:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
+    # Verify password; an oversized password can never match a stored hash
+    password_valid = False
+    if len(form_data.password.encode()) <= MAX_PASSWORD_BYTES:
+        async with _kdf_semaphore:
+            password_valid = await anyio.to_thread.run_sync(
+                verify_password, form_data.password, user.hashed_password
             )
 
-        # Check if user is active
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Inactive user",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        # Create access token
-        access_token = create_access_token(data={"sub": str(user.id)})
-
-        # Return token
-        return Token(access_token=access_token, token_type="bearer")
-
-    except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
-        raise
-    except Exception as e:
-        # Log the error (in a real application, use proper logging)
-        print(f"Unexpected error during user login: {str(e)}")
+    if not password_valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-        # Raise HTTP exception with structured response
+    # Check if user is active
+    if not user.is_active:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred during login"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Inactive user",
+            headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Create access token
+    access_token = create_access_token(data={"sub": str(user.id)})
+
+    # Return token
+    return Token(access_token=access_token, token_type="bearer")
+
 
 @router.get("/me", response_model=UserRead)
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db_session: AsyncSession = Depends(get_db_session)
+async def read_current_user(
+    user: UserRead = Depends(get_current_user)
 ) -> UserRead:
     """
     Get current authenticated user based on JWT token.
 
     Args:
-        token: JWT token from Authorization header
-        db_session: Database session for async operations
+        user: Authenticated user resolved from the Authorization header
 
     Returns:
         UserRead: Current user data (without password)
@@ -195,47 +189,4 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid or user doesn't exist
     """
-    try:
-        from backend.utils import verify_token
-
-        # Verify token and get user ID
-        user_id = verify_token(token)
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        # Get user from database
-        result = await db_session.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
-
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
-        # Return user data (excluding password)
-        return UserRead(
-            id=user.id,
-            email=user.email,
-            created_at=user.created_at,
-            is_active=user.is_active
-        )
-
-    except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
-        raise
-    except Exception as e:
-        # Log the error (in a real application, use proper logging)
-        print(f"Unexpected error getting current user: {str(e)}")
-
-        # Raise HTTP exception with structured response
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while retrieving user data"
-        )
\ No newline at end of file
+    return user
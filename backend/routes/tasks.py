@@ -1,27 +1,37 @@
 """
 Task routes for the Todo App backend API
 """
+from operator import attrgetter
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import bindparam, delete, update
 from sqlmodel import select
 
-try:
-    from dependencies import get_db_session, validate_user_id_match, get_user_id_from_token
-    from models.task import Task
-    from schemas.task import TaskCreate, TaskRead, TaskListResponse, TaskUpdate
-    from models.user import User
-except ImportError:
-    from backend.dependencies import get_db_session, validate_user_id_match, get_user_id_from_token
-    from backend.models.task import Task
-    from backend.schemas.task import TaskCreate, TaskRead, TaskListResponse, TaskUpdate
-    from backend.models.user import User
+from cache import get_cached_task_list, get_task_list_generation, invalidate_task_list, set_cached_task_list
+from dependencies import get_db_session, validate_user_id_match
+from models.task import Task
+from schemas.task import TaskCreate, TaskRead, TaskListResponse, TaskUpdate
+from schemas.task_fast import TaskListResponseFast, TaskReadFast
 
 
 # Create API router for task endpoints
 router = APIRouter()
 
 
+# Statements built once at import; only the bound values change per request
+_TASKS_BY_USER = select(Task).where(Task.user_id == bindparam("user_id"))
+_DELETE_TASK = delete(Task).where(Task.id == bindparam("id"), Task.user_id == bindparam("user_id"))
+
+# Shared msgspec encoder for the list response
+_encode_json = msgspec.json.Encoder().encode
+
+# Task columns pulled off a row in one C-level attrgetter call, in
+# TaskReadFast field order so the tuple can be passed positionally
+_task_getter = attrgetter(*TaskReadFast.__struct_fields__)
+
+
 @router.get("/{user_id}/tasks", response_model=TaskListResponse)
 async def list_tasks(
     user_id: int = Depends(validate_user_id_match),
@@ -40,45 +50,26 @@ async def list_tasks(
     Raises:
         HTTPException: If there's an error retrieving the tasks
     """
-    try:
-        # Query tasks for the specified user
-        # This ensures user isolation - only tasks belonging to the specified user are returned
-        statement = select(Task).where(Task.user_id == user_id)
-        result = await db_session.execute(statement)
-        tasks = result.scalars().all()
-
-        # Convert SQLModel Task objects to TaskRead Pydantic models
-        # Use model_dump with mode='python' to get a plain dict
-        task_reads = []
-        for task in tasks:
-            task_dict = {
-                'title': task.title,
-                'description': task.description,
-                'completed': task.completed,
-                'user_id': task.user_id,
-                'id': task.id,
-                'created_at': task.created_at,
-                'updated_at': task.updated_at,
-            }
-            task_reads.append(TaskRead.model_validate(task_dict))
-
-        # Return the tasks in the response model
-        return TaskListResponse(tasks=task_reads)
-
-    except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
-        raise
-    except Exception as e:
-        # Log the error (in a real application, use proper logging)
-        print(f"Unexpected error retrieving tasks for user {user_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
-
-        # Raise HTTP exception with structured response
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while retrieving tasks"
-        )
+    # Serve the list from the cache when nothing has changed since it was built.
+    # The generation is read before the query so a concurrent write can't
+    # leave a stale body under the key readers use next
+    generation = await get_task_list_generation(user_id)
+    if generation is not None:
+        cached_body = await get_cached_task_list(user_id, generation)
+        if cached_body is not None:
+            return Response(content=cached_body, media_type="application/json")
+
+    # Query tasks for the specified user
+    # This ensures user isolation - only tasks belonging to the specified user are returned
+    tasks = (await db_session.scalars(_TASKS_BY_USER, {"user_id": user_id})).all()
+
+    # Encode the rows with msgspec, bypassing pydantic on this hot path, and
+    # reuse the same bytes for the cache and the response
+    task_reads = [TaskReadFast(*_task_getter(task)) for task in tasks]
+    body = _encode_json(TaskListResponseFast(tasks=task_reads))
+    if generation is not None:
+        await set_cached_task_list(user_id, generation, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/{user_id}/tasks", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
@@ -101,46 +92,24 @@ async def create_task(
     Raises:
         HTTPException: If there's an error creating the task or validation fails
     """
-    try:
-        # Create a new task instance with the validated user_id
-        db_task = Task(
-            **task_create.model_dump(),
-            user_id=user_id
-        )
+    # Create a new task instance with the validated user_id
+    db_task = Task(
+        **task_create.model_dump(),
+        user_id=user_id
+    )
 
-        # Add the task to the database session
-        db_session.add(db_task)
-
-        # Commit the transaction to persist the task
-        await db_session.commit()
-
-        # Refresh the task to get the generated ID and timestamps
-        await db_session.refresh(db_task)
-
-        # Convert SQLModel Task to Pydantic TaskRead model
-        task_dict = {
-            'title': db_task.title,
-            'description': db_task.description,
-            'completed': db_task.completed,
-            'user_id': db_task.user_id,
-            'id': db_task.id,
-            'created_at': db_task.created_at,
-            'updated_at': db_task.updated_at,
-        }
-        return TaskRead.model_validate(task_dict)
-
-    except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
-        raise
-    except Exception as e:
-        # Log the error (in a real application, use proper logging)
-        print(f"Unexpected error creating task for user {user_id}: {str(e)}")
-
-        # Raise HTTP exception with structured response
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while creating the task"
-        )
+    # Add the task to the database session
+    db_session.add(db_task)
+
+    # Commit the transaction to persist the task
+    await db_session.commit()
+
+    # Refresh the task to get the generated ID and timestamps
+    await db_session.refresh(db_task)
+    await invalidate_task_list(user_id)
+
+    # response_model=TaskRead reads the fields straight off the row
+    return db_task
 
 
 @router.get("/{user_id}/tasks/{id}", response_model=TaskRead)
@@ -163,44 +132,64 @@ async def get_task(
     Raises:
         HTTPException: If the task doesn't exist or doesn't belong to the user
     """
-    try:
-        # Query for the specific task that belongs to the specified user
-        statement = select(Task).where(Task.id == id, Task.user_id == user_id)
-        result = await db_session.execute(statement)
-        task = result.scalar_one_or_none()
-
-        # If task doesn't exist or doesn't belong to the user, return 404
-        if task is None:
+    # Look up the task by primary key through the session identity map
+    task = await db_session.get(Task, id)
+
+    # If task doesn't exist or doesn't belong to the user, return 404
+    if task is None or task.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    # response_model=TaskRead reads the fields straight off the row
+    return task
+
+
+async def _apply_task_update(
+    id: int,
+    task_update: TaskUpdate,
+    user_id: int,
+    db_session: AsyncSession
+) -> Task:
+    """
+    Write the fields set on task_update to the user's task and return the row.
+    Shared by PUT and PATCH; a body with no fields set is answered from a
+    by-PK lookup without running an UPDATE or COMMIT
+    """
+    # Only the fields present in the request body are written
+    update_data = task_update.model_dump(exclude_unset=True)
+
+    if not update_data:
+        task = await db_session.get(Task, id)
+        if task is None or task.user_id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
             )
-
-        # Convert SQLModel Task to Pydantic TaskRead model
-        task_dict = {
-            'title': task.title,
-            'description': task.description,
-            'completed': task.completed,
-            'user_id': task.user_id,
-            'id': task.id,
-            'created_at': task.created_at,
-            'updated_at': task.updated_at,
-        }
-        return TaskRead.model_validate(task_dict)
-
-    except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
-        raise
-    except Exception as e:
-        # Log the error (in a real application, use proper logging)
-        print(f"Unexpected error retrieving task {id} for user {user_id}: {str(e)}")
-
-        # Raise HTTP exception with structured response
+        return task
+
+    # Update the task and read back the new row in a single round trip
+    statement = (
+        update(Task)
+        .where(Task.id == id, Task.user_id == user_id)
+        .values(**update_data)
+        .returning(Task)
+    )
+    task = (await db_session.execute(statement)).scalar_one_or_none()
+
+    # No row matched, so the task doesn't exist or belongs to another user
+    if task is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while retrieving the task"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
         )
 
+    # Commit the transaction to persist the changes
+    await db_session.commit()
+    await invalidate_task_list(user_id)
+    return task
+
 
 @router.put("/{user_id}/tasks/{id}", response_model=TaskRead)
 async def update_task(
@@ -224,56 +213,7 @@ async def update_task(
     Raises:
         HTTPException: If the task doesn't exist, doesn't belong to the user, or validation fails
     """
-    try:
-        # Query for the specific task that belongs to the specified user
-        statement = select(Task).where(Task.id == id, Task.user_id == user_id)
-        result = await db_session.execute(statement)
-        task = result.scalar_one_or_none()
-
-        # If task doesn't exist or doesn't belong to the user, return 404
-        if task is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Task not found"
-            )
-
-        # Prepare update data by filtering out None values to only update provided fields
-        update_data = task_update.model_dump(exclude_unset=True)
-
-        # Update task fields if they are provided in the request
-        for field, value in update_data.items():
-            setattr(task, field, value)
-
-        # Commit the transaction to persist the changes
-        await db_session.commit()
-
-        # Refresh the task to get the updated timestamps
-        await db_session.refresh(task)
-
-        # Convert SQLModel Task to Pydantic TaskRead model
-        task_dict = {
-            'title': task.title,
-            'description': task.description,
-            'completed': task.completed,
-            'user_id': task.user_id,
-            'id': task.id,
-            'created_at': task.created_at,
-            'updated_at': task.updated_at,
-        }
-        return TaskRead.model_validate(task_dict)
-
-    except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
-        raise
-    except Exception as e:
-        # Log the error (in a real application, use proper logging)
-        print(f"Unexpected error updating task {id} for user {user_id}: {str(e)}")
-
-        # Raise HTTP exception with structured response
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while updating the task"
-        )
+    return await _apply_task_update(id, task_update, user_id, db_session)
 
 
 @router.patch("/{user_id}/tasks/{id}", response_model=TaskRead)
@@ -299,56 +239,7 @@ async def partial_update_task(
     Raises:
         HTTPException: If the task doesn't exist, doesn't belong to the user, or validation fails
     """
-    try:
-        # Query for the specific task that belongs to the specified user
-        statement = select(Task).where(Task.id == id, Task.user_id == user_id)
-        result = await db_session.execute(statement)
-        task = result.scalar_one_or_none()
-
-        # If task doesn't exist or doesn't belong to the user, return 404
-        if task is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Task not found"
-            )
-
-        # Prepare update data by filtering out None values to only update provided fields
-        update_data = task_update.model_dump(exclude_unset=True)
-
-        # Update task fields if they are provided in the request
-        for field, value in update_data.items():
-            setattr(task, field, value)
-
-        # Commit the transaction to persist the changes
-        await db_session.commit()
-
-        # Refresh the task to get the updated timestamps
-        await db_session.refresh(task)
-
-        # Convert SQLModel Task to Pydantic TaskRead model
-        task_dict = {
-            'title': task.title,
-            'description': task.description,
-            'completed': task.completed,
-            'user_id': task.user_id,
-            'id': task.id,
-            'created_at': task.created_at,
-            'updated_at': task.updated_at,
-        }
-        return TaskRead.model_validate(task_dict)
-
-    except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
-        raise
-    except Exception as e:
-        # Log the error (in a real application, use proper logging)
-        print(f"Unexpected error partially updating task {id} for user {user_id}: {str(e)}")
-
-        # Raise HTTP exception with structured response
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while partially updating the task"
-        )
+    return await _apply_task_update(id, task_update, user_id, db_session)
 
 
 @router.delete("/{user_id}/tasks/{id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -371,37 +262,19 @@ async def delete_task(
     Raises:
         HTTPException: If the task doesn't exist or doesn't belong to the user
     """
-    try:
-        # Query for the specific task that belongs to the specified user
-        statement = select(Task).where(Task.id == id, Task.user_id == user_id)
-        result = await db_session.execute(statement)
-        task = result.scalar_one_or_none()
-
-        # If task doesn't exist or doesn't belong to the user, return 404
-        if task is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Task not found"
-            )
-
-        # Delete the task from the database
-        await db_session.delete(task)
-
-        # Commit the transaction to persist the deletion
-        await db_session.commit()
+    # Delete the task in one statement without loading it first
+    result = await db_session.execute(_DELETE_TASK, {"id": id, "user_id": user_id})
 
-        # Return 204 No Content as required for successful deletion
-        return None
+    # If task doesn't exist or doesn't belong to the user, return 404
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
 
-    except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
-        raise
-    except Exception as e:
-        # Log the error (in a real application, use proper logging)
-        print(f"Unexpected error deleting task {id} for user {user_id}: {str(e)}")
+    # Commit the transaction to persist the deletion
+    await db_session.commit()
+    await invalidate_task_list(user_id)
 
-        # Raise HTTP exception with structured response
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while deleting the task"
-        )
\ No newline at end of file
+    # Return 204 No Content as required for successful deletion
+    return None
@@ -3,7 +3,7 @@ Task schemas for the Todo App backend API
 """
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TaskBase(BaseModel):
@@ -40,6 +40,8 @@ class TaskRead(TaskBase):
     """
     Schema for reading a task with its ID and timestamps
     """
+    model_config = ConfigDict(frozen=True, from_attributes=True, extra="ignore")
+
     id: int
     user_id: int
     created_at: datetime
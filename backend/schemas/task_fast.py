@@ -0,0 +1,27 @@
+"""
+msgspec task schemas for the Todo App backend API read path
+"""
+from datetime import datetime
+from typing import List, Optional
+import msgspec
+
+
+class TaskReadFast(msgspec.Struct):
+    """
+    msgspec mirror of TaskRead for encoding trusted database rows.
+    Fields follow TaskRead's order so both encode to the same JSON
+    """
+    title: str
+    description: Optional[str]
+    completed: bool
+    id: int
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class TaskListResponseFast(msgspec.Struct):
+    """
+    msgspec mirror of TaskListResponse
+    """
+    tasks: List[TaskReadFast]
@@ -0,0 +1,10 @@
+"""
+Pytest configuration for the Todo App backend API tests
+"""
+import os
+import sys
+
+# The app uses flat imports rooted at the backend directory, as on HF
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
@@ -0,0 +1,66 @@
+"""
+Tests for the password hashing helpers in utils.py
+"""
+import pytest
+
+from utils import get_password_hash, verify_password
+
+
+# Generated with passlib 1.7.4: pbkdf2_sha256.hash("correct horse battery staple")
+PASSLIB_HASH = "$pbkdf2-sha256$29000$nBMiJEQoZYxxTimFUIoRog$Hkhpn/HLbF1HNuxmfmOlArm/Xy8bkp33eXyA/DU.UXA"
+# Generated with passlib 1.7.4: pbkdf2_sha256.using(rounds=1000).hash("pässwörd")
+PASSLIB_UNICODE_HASH = "$pbkdf2-sha256$1000$sfbeG8O49763lhJCCEGodQ$IJ8WKRA93SipMuahLuze1omsNT45xSqGsU6iqLADlnI"
+
+
+def test_verify_passlib_hash():
+    """
+    Hashes stored while passlib was in use still verify
+    """
+    assert verify_password("correct horse battery staple", PASSLIB_HASH)
+    assert verify_password("pässwörd", PASSLIB_UNICODE_HASH)
+
+
+def test_verify_passlib_hash_wrong_password():
+    assert not verify_password("correct horse battery stapler", PASSLIB_HASH)
+    assert not verify_password("passwörd", PASSLIB_UNICODE_HASH)
+
+
+def test_hash_round_trip():
+    hashed = get_password_hash("s3cret")
+    assert hashed.startswith("$pbkdf2-sha256$")
+    assert verify_password("s3cret", hashed)
+    assert not verify_password("s3cret ", hashed)
+
+
+def test_hash_is_salted():
+    assert get_password_hash("s3cret") != get_password_hash("s3cret")
+
+
+def test_hash_verifies_with_passlib():
+    """
+    New hashes stay readable by passlib, should it ever be used again
+    """
+    pbkdf2_sha256 = pytest.importorskip("passlib.hash").pbkdf2_sha256
+    assert pbkdf2_sha256.verify("s3cret", get_password_hash("s3cret"))
+
+
+@pytest.mark.parametrize(
+    "hashed_password",
+    [
+        "garbage",
+        "",
+        # Salt that is not valid base64
+        "$pbkdf2-sha256$29000$abcde$Hkhpn/HLbF1HNuxmfmOlArm/Xy8bkp33eXyA/DU.UXA",
+        # Checksum with non-ASCII characters
+        "$pbkdf2-sha256$29000$nBMiJEQoZYxxTimFUIoRog$é",
+        # Rounds that are not a positive integer
+        "$pbkdf2-sha256$abc$nBMiJEQoZYxxTimFUIoRog$Hkhpn/HLbF1HNuxmfmOlArm/Xy8bkp33eXyA/DU.UXA",
+        "$pbkdf2-sha256$0$nBMiJEQoZYxxTimFUIoRog$Hkhpn/HLbF1HNuxmfmOlArm/Xy8bkp33eXyA/DU.UXA",
+        # Too many fields
+        PASSLIB_HASH + "$extra",
+        # Other scheme with an otherwise valid hash
+        PASSLIB_HASH.replace("pbkdf2-sha256", "pbkdf2-sha512"),
+    ],
+)
+def test_verify_malformed_hash_returns_false(hashed_password):
+    assert verify_password("correct horse battery staple", hashed_password) is False
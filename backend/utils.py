@@ -1,26 +1,54 @@
 """
 Utility functions for the Todo App backend API
 """
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+import jwt
+from cachetools import TLRUCache
 
-try:
-    from config import settings
-except ImportError:
-    from backend.config import settings
+from config import get_settings
 
+settings = get_settings()
 
-# Password hashing context - using pbkdf2 instead of bcrypt for Windows compatibility
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+# HMAC key bytes for signing and verifying tokens, encoded once at import
+_SIGNING_KEY = settings.SECRET_KEY.encode("utf-8")
+
+# Longest password accepted, matching the limit passlib used to enforce
+MAX_PASSWORD_BYTES = 4096
+
+# Password hashes use pbkdf2 instead of bcrypt for Windows compatibility, in
+# passlib's "$pbkdf2-sha256$<rounds>$<salt>$<checksum>" format so hashes
+# stored before passlib was dropped still verify
+_PBKDF2_SCHEME = "pbkdf2-sha256"
+_PBKDF2_SALT_BYTES = 16
+
+
+def _ab64_encode(data: bytes) -> str:
+    """
+    Encode bytes with passlib's adapted base64 ("." for "+", no padding)
+    """
+    return base64.b64encode(data).decode("ascii").rstrip("=").replace("+", ".")
+
+
+def _ab64_decode(data: str) -> bytes:
+    """
+    Decode passlib's adapted base64
+    """
+    data = data.replace(".", "+")
+    return base64.b64decode(data + "=" * (-len(data) % 4))
 
 
 def update_timestamp():
     """
     Generate a new timestamp for updated_at fields
     """
-    return datetime.utcnow()
+    return datetime.now(timezone.utc)
 
 
 def validate_user_ownership(user_id: int, task_user_id: int) -> bool:
@@ -45,42 +73,77 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        _, scheme, rounds, salt, checksum = hashed_password.split("$")
+        expected = _ab64_decode(checksum)
+        derived = hashlib.pbkdf2_hmac(
+            "sha256", plain_password.encode("utf-8"), _ab64_decode(salt), int(rounds)
+        )
+    except ValueError:
+        # Malformed stored hash
+        return False
+    return scheme == _PBKDF2_SCHEME and hmac.compare_digest(derived, expected)
 
 
 def get_password_hash(password: str) -> str:
     """
     Generate a hash for a plain password
     """
-    return pwd_context.hash(password)
+    rounds = settings.PASSWORD_HASH_ROUNDS
+    salt = secrets.token_bytes(_PBKDF2_SALT_BYTES)
+    derived = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, rounds)
+    return f"${_PBKDF2_SCHEME}${rounds}${_ab64_encode(salt)}${_ab64_encode(derived)}"
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
     Create a JWT access token
     """
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    now = datetime.now(timezone.utc)
+    expire = now + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    return jwt.encode({**data, "exp": expire}, _SIGNING_KEY, algorithm=settings.ALGORITHM)
+
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+# Decoded tokens keyed by the raw token string. Entries live at most
+# _TOKEN_CACHE_TTL seconds and never past the token's own expiry
+_TOKEN_CACHE_TTL = 60
+_token_cache = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda _token, decoded, now: min(now + _TOKEN_CACHE_TTL, decoded[1]),
+    timer=time.time,
+)
 
 
-def verify_token(token: str):
+def _decode_token(token: str) -> Optional[Tuple[int, float]]:
     """
-    Verify a JWT token and return the payload
+    Decode a JWT token and return its user ID and expiry timestamp
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id_str = payload.get("sub")
-        if user_id_str is None:
-            return None
-        return int(user_id_str)  # Convert to int since JWT encodes as string
-    except JWTError:
+        payload = jwt.decode(
+            token,
+            _SIGNING_KEY,
+            algorithms=[settings.ALGORITHM],
+            options={"require": ["exp", "sub"]},
+        )
+        # Convert to int since JWT encodes as string
+        return int(payload["sub"]), float(payload["exp"])
+    except jwt.PyJWTError:
         return None
     except (ValueError, TypeError):
-        return None
\ No newline at end of file
+        return None
+
+
+def verify_token(token: str) -> Optional[int]:
+    """
+    Verify a JWT token and return the user ID, reusing cached decodes until the token expires
+    """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        return cached[0]
+
+    decoded = _decode_token(token)
+    if decoded is None:
+        return None
+    # The cache drops entries whose expiry has already passed
+    _token_cache[token] = decoded
+    return decoded[0]